@@ -1,13 +1,67 @@
 import sys
+import argparse
 import asyncio
-from src.app.pipeline import run_pipeline
+from src.app.pipeline import plan_pipeline, run_pipeline
+from src.translation.translator import create_translator
+
+USAGE = (
+    "python main.py <URL> [--tabs N] [--translator SPEC] [--workers N|auto]\n"
+    "       python main.py plan <URL> [--tabs N] [--translator SPEC]\n"
+    "       python main.py serve [PORT]"
+)
+
+
+def _workers(value):
+    return None if value == "auto" else int(value)
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(usage=USAGE)
+    parser.add_argument("url")
+    parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="チャプターを分担して並列にスクレイピングするタブ数",
+    )
+    parser.add_argument(
+        "--translator",
+        help="ブラウザを使わずに取得し、指定のバックエンドで翻訳する (google | file:<path>)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=_workers,
+        default=1,
+        help="音声合成の並列数。auto の場合は見積もり結果から自動で決定する",
+    )
+    return parser.parse_args(argv)
+
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("使用方法: python main.py <URL>")
+        print(f"使用方法: {USAGE}")
         sys.exit(1)
     try:
-        asyncio.run(run_pipeline(sys.argv[1]))
+        if sys.argv[1] == "serve":
+            from src.app.server import serve, DEFAULT_PORT
+
+            port = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_PORT
+            serve(port=port)
+        elif sys.argv[1] == "plan":
+            args = _parse_args(sys.argv[2:])
+            translator = create_translator(args.translator) if args.translator else None
+            asyncio.run(plan_pipeline(args.url, tabs=args.tabs, translator=translator))
+        else:
+            args = _parse_args(sys.argv[1:])
+            translator = create_translator(args.translator) if args.translator else None
+            asyncio.run(
+                run_pipeline(
+                    args.url,
+                    tabs=args.tabs,
+                    translator=translator,
+                    workers=args.workers,
+                )
+            )
     except Exception as e:
         print(f"エラーが発生しました: {e}")
         sys.exit(1)
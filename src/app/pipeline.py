@@ -1,8 +1,12 @@
 import os
 import json
 import asyncio
+from typing import Callable
 from src.parsing.scraper import WebScraper
+from src.parsing.http_fetcher import HttpFetcher
 from src.parsing.parser import HTMLParser
+from src.translation.memory import TranslationMemory
+from src.translation.translator import Translator, translate_transcript_data
 from src.utils.utils import extract_episode_name_from_url, save_json
 from src.audio.audio_synthesizer import AudioSynthesizer
 from src.data_models.transcript_utils import (
@@ -11,12 +15,28 @@ from src.data_models.transcript_utils import (
 )
 from src.data_models.transcript_models import Transcript
 from src.parsing.preprocess import preprocess_data
+from src.app.planner import EpisodePlan, plan_episode, print_plan, save_plan
 
 
-async def _get_raw_data(url: str, episode_name: str) -> str | None:
+# (ステージ名, 処理済み数, 総数) で呼ばれる進捗コールバック
+ProgressCallback = Callable[[str, int, int], None]
+
+
+async def _get_raw_data(
+    url: str,
+    episode_name: str,
+    html_content: str | None = None,
+    browser=None,
+    tabs: int = 1,
+    translator: Translator | None = None,
+    translation_memory: TranslationMemory | None = None,
+) -> str | None:
     """
     URLから生データを取得し、ファイルに保存する。
     既存ファイルがあればそれを読み込む。
+    html_content が渡された場合はスクレイピングせずにそれを解析する。
+    translator が渡された場合はブラウザを使わず、元ページをHTTPで取得して翻訳する。
+    このとき html_content は翻訳済みのページではなく元の(英語の)ページとして扱い、翻訳する。
     """
     output_dir = os.path.join("output", "data")
     raw_data_file_path = os.path.join(output_dir, f"{episode_name}.json")
@@ -25,20 +45,66 @@ async def _get_raw_data(url: str, episode_name: str) -> str | None:
         print(f"既存のJSONファイルが見つかりました: {raw_data_file_path}")
         return raw_data_file_path
 
-    translate_url = (
-        f"https://translate.google.com/translate?sl=auto&tl=ja&hl=ja&u={url}"
-    )
+    if translator is not None:
+        return await asyncio.to_thread(
+            _fetch_and_translate,
+            url,
+            raw_data_file_path,
+            html_content,
+            translator,
+            translation_memory or TranslationMemory(translator.memory_key),
+        )
+
+    if html_content is None:
+        translate_url = (
+            f"https://translate.google.com/translate?sl=auto&tl=ja&hl=ja&u={url}"
+        )
+
+        scraper = WebScraper(translate_url, browser=browser, tabs=tabs)
+        await scraper.fetch_content()
+        html_content = scraper.get_content()
+
+    parser = HTMLParser(html_content)
+    transcript_data = parser.extract_conversation_structure()
+
+    if not transcript_data:
+        print(f"Could not find content with class 'entry-content' on {url}.")
+        return None
+
+    return _save_raw_data(transcript_data, raw_data_file_path, url)
+
 
-    scraper = WebScraper(translate_url)
-    await scraper.fetch_content()
+def _fetch_and_translate(
+    url: str,
+    raw_data_file_path: str,
+    html_content: str | None,
+    translator: Translator,
+    translation_memory: TranslationMemory,
+) -> str | None:
+    """
+    元の(英語の)ページをHTTPで取得・解析し、翻訳バックエンドで翻訳して保存する。
+    html_content が渡された場合は取得を省略する (元の英語のページであること)。
+    """
+    if html_content is None:
+        fetcher = HttpFetcher(url)
+        fetcher.fetch_content()
+        html_content = fetcher.get_content()
 
-    parser = HTMLParser(scraper.get_content())
+    parser = HTMLParser(html_content)
     transcript_data = parser.extract_conversation_structure()
 
     if not transcript_data:
         print(f"Could not find content with class 'entry-content' on {url}.")
         return None
 
+    transcript_data = translate_transcript_data(
+        transcript_data, translator, translation_memory
+    )
+    return _save_raw_data(transcript_data, raw_data_file_path, url)
+
+
+def _save_raw_data(transcript_data: list, raw_data_file_path: str, url: str) -> str:
+    """抽出したチャプター構造を生データファイルとして保存し、そのパスを返す"""
     try:
         save_json(transcript_data, raw_data_file_path)
     except Exception as e:
@@ -91,29 +157,145 @@ def _load_transcript(preprocessed_json_file_path: str) -> Transcript:
     return transcript_load_from_json(preprocessed_json_file_path)
 
 
-def _synthesize_episode_audio(transcript: Transcript, episode_name: str) -> None:
+def _synthesize_episode_audio(
+    transcript: Transcript,
+    episode_name: str,
+    google_tts_client=None,
+    on_progress: ProgressCallback | None = None,
+    workers: int = 1,
+) -> None:
     """
     Transcriptオブジェクトから音声合成を実行する。
     """
-    synthesizer = AudioSynthesizer(episode_name, transcript.podcast_name)
+    synthesizer = AudioSynthesizer(
+        episode_name,
+        transcript.podcast_name,
+        google_tts_client=google_tts_client,
+        max_workers=workers,
+        on_progress=(
+            (lambda done, total: on_progress("synthesize", done, total))
+            if on_progress
+            else None
+        ),
+    )
     synthesizer.synthesize_from_transcript(transcript)
 
 
-async def run_pipeline(url: str) -> None:
-    episode_name = extract_episode_name_from_url(url)
+def _plan_and_save(transcript: Transcript, episode_name: str) -> EpisodePlan:
+    """
+    合成前に文字数・リクエスト数・所要時間を見積もり、計画をファイルに保存する。
+    """
+    plan = plan_episode(transcript, episode_name)
+    print_plan(plan)
+    plan_file_path = save_plan(plan)
+    print(f"計画を保存しました: {plan_file_path}")
+    return plan
+
+
+async def _prepare_transcript(
+    url: str,
+    episode_name: str,
+    html_content: str | None = None,
+    browser=None,
+    tabs: int = 1,
+    translator: Translator | None = None,
+    translation_memory: TranslationMemory | None = None,
+    on_progress: ProgressCallback | None = None,
+) -> Transcript | None:
+    """
+    取得・前処理を行い (既存ファイルがあればそれを使い)、Transcriptを返す。
+    途中で処理を中断した場合は None を返す。
+    """
+
+    def report(stage: str) -> None:
+        if on_progress:
+            on_progress(stage, 0, 0)
 
     # 1. scraping (or load file)
-    raw_data_file_path = await _get_raw_data(url, episode_name)
+    report("scrape")
+    raw_data_file_path = await _get_raw_data(
+        url,
+        episode_name,
+        html_content=html_content,
+        browser=browser,
+        tabs=tabs,
+        translator=translator,
+        translation_memory=translation_memory,
+    )
     if raw_data_file_path is None:
-        return
+        return None
 
     # 2. preprocess and save
+    report("preprocess")
     preprocessed_json_file_path = _preprocess_and_save(raw_data_file_path, episode_name)
     if preprocessed_json_file_path is None:
-        return
+        return None
 
     # 3. load transcript
-    transcript = _load_transcript(preprocessed_json_file_path)
+    return _load_transcript(preprocessed_json_file_path)
+
+
+async def plan_pipeline(
+    url: str, tabs: int = 1, translator: Translator | None = None
+) -> EpisodePlan | None:
+    """
+    音声合成は行わず、取得・前処理の後に合成の見積もりだけを行う。
+    """
+    episode_name = extract_episode_name_from_url(url)
+    transcript = await _prepare_transcript(
+        url, episode_name, tabs=tabs, translator=translator
+    )
+    if transcript is None:
+        return None
+    return _plan_and_save(transcript, episode_name)
+
+
+async def run_pipeline(
+    url: str,
+    html_content: str | None = None,
+    browser=None,
+    google_tts_client=None,
+    on_progress: ProgressCallback | None = None,
+    tabs: int = 1,
+    translator: Translator | None = None,
+    translation_memory: TranslationMemory | None = None,
+    workers: int | None = 1,
+) -> bool:
+    """
+    URL (または保存済みHTML) から音声合成までを一通り実行する。
+    browser / google_tts_client を渡すと起動済みのものを使い回す。
+    tabs が2以上の場合はチャプターを分担して複数タブで並列にスクレイピングする。
+    translator を渡すとブラウザを使わずに取得し、そのバックエンドで翻訳する。
+    workers に None を渡すと、見積もり結果から合成の並列数を自動で決定する。
+    途中で処理を中断した場合は False を返す。
+    """
+    episode_name = extract_episode_name_from_url(url)
+
+    # 1-3. scraping, preprocess, load transcript
+    transcript = await _prepare_transcript(
+        url,
+        episode_name,
+        html_content=html_content,
+        browser=browser,
+        tabs=tabs,
+        translator=translator,
+        translation_memory=translation_memory,
+        on_progress=on_progress,
+    )
+    if transcript is None:
+        return False
+
+    if workers is None:
+        plan = _plan_and_save(transcript, episode_name)
+        workers = plan.get_engine("google").recommended_concurrency
+        print(f"合成の並列数を {workers} に設定しました")
 
     # 4. synthesize
-    _synthesize_episode_audio(transcript, episode_name)
+    _synthesize_episode_audio(
+        transcript,
+        episode_name,
+        google_tts_client=google_tts_client,
+        on_progress=on_progress,
+        workers=workers,
+    )
+    return True
@@ -0,0 +1,186 @@
+import os
+import math
+from dataclasses import dataclass, field, asdict
+from src.audio.file_manager import AudioFileManager
+from src.audio.latency_model import LatencyModel
+from src.constants import GOOGLE_TTS_REQUESTS_PER_MINUTE
+from src.data_models.transcript_models import Transcript
+from src.utils.utils import save_json
+
+# 検討する並列数の候補
+CONCURRENCY_CANDIDATES = (1, 2, 4, 8, 16, 32)
+# 最速の予測時間からこの割合以内であれば、より小さい並列数を採用する
+CONCURRENCY_TOLERANCE = 0.1
+
+
+@dataclass
+class EngineSpec:
+    # 1セグメントあたりのリクエスト数
+    requests_per_segment: int
+    # 1分あたりのリクエスト数の上限 (None の場合は制限なし)
+    requests_per_minute: int | None
+    # エンジン側で同時に処理できるリクエスト数 (None の場合は制限なし)
+    max_parallelism: int | None
+
+
+# Google TTS は既定のクォータ、VOICEVOX はローカルエンジンが1件ずつ処理する想定
+ENGINES = {
+    "google": EngineSpec(
+        requests_per_segment=1,
+        requests_per_minute=GOOGLE_TTS_REQUESTS_PER_MINUTE,
+        max_parallelism=None,
+    ),
+    "voicevox": EngineSpec(
+        requests_per_segment=2, requests_per_minute=None, max_parallelism=1
+    ),
+}
+
+
+@dataclass
+class EnginePlan:
+    engine: str
+    total_chars: int
+    total_requests: int
+    new_chars: int
+    new_requests: int
+    estimated_audio_minutes: float
+    latency_samples: int
+    # 所要時間の実績がある並列数
+    observed_concurrency: list[int] = field(default_factory=list)
+    # 並列数 -> 予測所要時間(秒)
+    wall_time_by_concurrency: dict[int, float] = field(default_factory=dict)
+    recommended_concurrency: int = 1
+
+
+@dataclass
+class EpisodePlan:
+    episode_name: str
+    total_segments: int
+    cached_segments: int
+    cache_hit_rate: float
+    engines: list[EnginePlan]
+
+    def get_engine(self, engine: str) -> EnginePlan:
+        return next(plan for plan in self.engines if plan.engine == engine)
+
+
+def plan_episode(
+    transcript: Transcript,
+    episode_name: str,
+    latency_model: LatencyModel | None = None,
+) -> EpisodePlan:
+    """
+    前処理済みのTranscriptから、エンジンごとの文字数・リクエスト数、キャッシュのヒット率、
+    並列数ごとの予測所要時間を計算し、推奨の並列数を決定します。
+    """
+    latency_model = latency_model or LatencyModel()
+    file_manager = AudioFileManager(episode_name, transcript.podcast_name)
+
+    all_lengths = []
+    new_lengths = []
+    for chapter in transcript.chapters:
+        for idx, segment in enumerate(chapter.segments):
+            all_lengths.append(len(segment.text))
+            # 生成済みの音声ファイルは再合成しない
+            if not os.path.exists(file_manager.get_segment_path(chapter.no, idx)):
+                new_lengths.append(len(segment.text))
+
+    total_segments = len(all_lengths)
+    cached_segments = total_segments - len(new_lengths)
+
+    engines = [
+        _plan_engine(engine, spec, all_lengths, new_lengths, latency_model)
+        for engine, spec in ENGINES.items()
+    ]
+    return EpisodePlan(
+        episode_name=episode_name,
+        total_segments=total_segments,
+        cached_segments=cached_segments,
+        cache_hit_rate=cached_segments / total_segments if total_segments else 0.0,
+        engines=engines,
+    )
+
+
+def _plan_engine(
+    engine: str,
+    spec: EngineSpec,
+    all_lengths: list[int],
+    new_lengths: list[int],
+    latency_model: LatencyModel,
+) -> EnginePlan:
+    new_requests = len(new_lengths) * spec.requests_per_segment
+    # クォータ上、これより速くは処理できない
+    quota_seconds = (
+        new_requests / spec.requests_per_minute * 60 if spec.requests_per_minute else 0.0
+    )
+
+    wall_time_by_concurrency = {}
+    for concurrency in CONCURRENCY_CANDIDATES:
+        effective = min(
+            concurrency, spec.max_parallelism or concurrency, len(new_lengths) or 1
+        )
+        # 並列数ごとの遅延の増加を含めた1リクエストの所要時間を、同時に処理する件数で割る
+        busy_seconds = latency_model.predict_total_seconds(
+            engine, new_lengths, effective
+        )
+        wall_time_by_concurrency[concurrency] = max(
+            busy_seconds / effective, quota_seconds
+        )
+
+    best = min(wall_time_by_concurrency.values())
+    recommended = next(
+        concurrency
+        for concurrency, seconds in wall_time_by_concurrency.items()
+        if seconds <= best * (1 + CONCURRENCY_TOLERANCE)
+    )
+
+    return EnginePlan(
+        engine=engine,
+        total_chars=sum(all_lengths),
+        total_requests=len(all_lengths) * spec.requests_per_segment,
+        new_chars=sum(new_lengths),
+        new_requests=new_requests,
+        estimated_audio_minutes=sum(
+            latency_model.predict_audio_seconds(engine, length)
+            for length in all_lengths
+        )
+        / 60,
+        latency_samples=latency_model.sample_count(engine),
+        observed_concurrency=latency_model.observed_concurrency(engine),
+        wall_time_by_concurrency=wall_time_by_concurrency,
+        recommended_concurrency=recommended,
+    )
+
+
+def save_plan(plan: EpisodePlan) -> str:
+    """計画をJSONファイルに保存し、そのパスを返します"""
+    file_path = os.path.join("output", "data", f"{plan.episode_name}_plan.json")
+    return save_json(asdict(plan), file_path)
+
+
+def print_plan(plan: EpisodePlan) -> None:
+    """計画の内容を表示します"""
+    print(f"--- Plan: {plan.episode_name} ---")
+    print(
+        f"セグメント数: {plan.total_segments} "
+        f"(生成済み {plan.cached_segments}件, ヒット率 {plan.cache_hit_rate:.0%})"
+    )
+    for engine in plan.engines:
+        print(f"[{engine.engine}]")
+        print(f"  文字数: {engine.total_chars} (新規 {engine.new_chars})")
+        print(f"  リクエスト数: {engine.total_requests} (新規 {engine.new_requests})")
+        print(f"  音声の長さ(推定): {engine.estimated_audio_minutes:.1f}分")
+        if engine.latency_samples == 0:
+            print("  ※ 実績が無いため所要時間は想定値で計算しています")
+        else:
+            print(f"  実績のある並列数: {engine.observed_concurrency}")
+        for concurrency, seconds in engine.wall_time_by_concurrency.items():
+            mark = " <- 推奨" if concurrency == engine.recommended_concurrency else ""
+            print(f"  並列数 {concurrency:>2}: {_format_duration(seconds)}{mark}")
+    print("-------------------------")
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, sec = divmod(math.ceil(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}時間{minutes:02d}分{sec:02d}秒" if hours else f"{minutes}分{sec:02d}秒"
@@ -0,0 +1,473 @@
+import os
+import json
+import time
+import uuid
+import asyncio
+import threading
+from dataclasses import dataclass, asdict
+from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from playwright.async_api import async_playwright
+from src.app.pipeline import run_pipeline
+from src.audio.audio_synthesizer import create_google_tts_client
+from src.translation.memory import TranslationMemory
+from src.translation.translator import Translator, create_translator
+from src.utils.utils import save_json
+
+JOBS_DIR = os.path.join("output", "jobs")
+STATE_FILE = os.path.join(JOBS_DIR, "jobs.json")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# 同じステージ内の進捗は、この件数ごとにだけ状態ファイルへ保存する
+PROGRESS_SAVE_INTERVAL = 20
+
+# ワーカーのループが異常終了した場合の再起動の待機秒数 (失敗が続くたびに倍にする)
+WORKER_RESTART_BASE_SEC = 1.0
+WORKER_RESTART_MAX_SEC = 60.0
+
+
+class JobStatus(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class JobCancelledError(Exception):
+    """実行中のジョブがキャンセルされたことを表す例外"""
+
+
+@dataclass
+class Job:
+    id: str
+    url: str
+    priority: int = 0
+    tabs: int = 1
+    translator: str | None = None
+    # None の場合は見積もり結果から合成の並列数を自動で決定する
+    workers: int | None = 1
+    status: JobStatus = JobStatus.QUEUED
+    stage: str = ""
+    done: int = 0
+    total: int = 0
+    error: str = ""
+    html_path: str | None = None
+    cancel_requested: bool = False
+    created_at: float = 0.0
+    updated_at: float = 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        return cls(**{**data, "status": JobStatus(data["status"])})
+
+
+class JobQueue:
+    """優先度付きのジョブキュー。状態はJSONファイルに永続化し、再起動後も引き継ぐ"""
+
+    def __init__(self, state_file: str = STATE_FILE):
+        self.state_file = state_file
+        self._jobs: dict[str, Job] = {}
+        self._cond = threading.Condition()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.state_file):
+            return
+        with open(self.state_file, "r", encoding="utf-8") as f:
+            for data in json.load(f):
+                job = Job.from_dict(data)
+                # 前回の実行中に停止したジョブはキューに戻す (キャンセル要求済みならキャンセル扱い)
+                if job.status == JobStatus.RUNNING:
+                    if job.cancel_requested:
+                        job.status = JobStatus.CANCELLED
+                        job.cancel_requested = False
+                    else:
+                        job.status = JobStatus.QUEUED
+                        job.stage, job.done, job.total = "", 0, 0
+                self._jobs[job.id] = job
+        print(f"ジョブ状態を復元しました: {self.state_file} ({len(self._jobs)}件)")
+
+    def _save(self) -> None:
+        """ロック取得済みの状態で呼ぶこと"""
+        save_json([job.to_dict() for job in self._jobs.values()], self.state_file)
+
+    def submit(
+        self,
+        url: str,
+        priority: int = 0,
+        html: str | None = None,
+        tabs: int = 1,
+        translator: str | None = None,
+        workers: int | None = 1,
+    ) -> Job:
+        """
+        ジョブを登録する。html が渡された場合はファイルに保存しスクレイピングを省略する。
+        html は translator が無い場合は翻訳済みのページ、ある場合は元の(英語の)ページとして扱う。
+        """
+        now = time.time()
+        job = Job(
+            id=uuid.uuid4().hex[:12],
+            url=url,
+            priority=priority,
+            tabs=tabs,
+            translator=translator,
+            workers=workers,
+            created_at=now,
+            updated_at=now,
+        )
+        if html is not None:
+            job.html_path = os.path.join(JOBS_DIR, f"{job.id}.html")
+            os.makedirs(JOBS_DIR, exist_ok=True)
+            with open(job.html_path, "w", encoding="utf-8") as f:
+                f.write(html)
+
+        with self._cond:
+            self._jobs[job.id] = job
+            self._save()
+            self._cond.notify()
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list(self) -> list[Job]:
+        with self._cond:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at)
+
+    def cancel(self, job_id: str) -> Job | None:
+        """待機中のジョブは即座に、実行中のジョブは次の進捗報告時にキャンセルする"""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status == JobStatus.QUEUED:
+                job.status = JobStatus.CANCELLED
+            elif job.status == JobStatus.RUNNING:
+                job.cancel_requested = True
+            job.updated_at = time.time()
+            self._save()
+            return job
+
+    def next_job(self) -> Job:
+        """優先度が最も高い待機中ジョブを取り出す。無ければ登録されるまで待つ"""
+        with self._cond:
+            while True:
+                queued = [
+                    job for job in self._jobs.values()
+                    if job.status == JobStatus.QUEUED
+                ]
+                if queued:
+                    job = min(queued, key=lambda j: (-j.priority, j.created_at))
+                    job.status = JobStatus.RUNNING
+                    job.cancel_requested = False
+                    job.updated_at = time.time()
+                    self._save()
+                    return job
+                self._cond.wait()
+
+    def update_progress(self, job_id: str, stage: str, done: int, total: int) -> None:
+        """進捗を記録する。キャンセル要求があれば JobCancelledError を送出する"""
+        with self._cond:
+            job = self._jobs[job_id]
+            # ファイルへの書き込みはステージの切り替わりと一定件数ごとに限る
+            should_save = (
+                job.stage != stage
+                or done == total
+                or done % PROGRESS_SAVE_INTERVAL == 0
+            )
+            job.stage, job.done, job.total = stage, done, total
+            job.updated_at = time.time()
+            if should_save:
+                self._save()
+            if job.cancel_requested:
+                raise JobCancelledError(f"ジョブがキャンセルされました: {job_id}")
+
+    def finish(self, job_id: str, status: JobStatus, error: str = "") -> None:
+        with self._cond:
+            job = self._jobs[job_id]
+            job.status = status
+            job.error = error
+            job.cancel_requested = False
+            job.updated_at = time.time()
+            self._save()
+
+
+class JobWorker(threading.Thread):
+    """Chromium・Google TTS クライアント・翻訳バックエンドを起動したまま保持し、ジョブを順に処理する"""
+
+    def __init__(self, queue: JobQueue):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.translators: dict[str, Translator] = {}
+        # 翻訳バックエンドごとの翻訳メモリ
+        self.translation_memories: dict[str, TranslationMemory] = {}
+        self.browser = None
+        # ジョブを待ち受けるループが動作中かどうか
+        self.running = False
+        self.restarts = 0
+        # ブラウザ起動やワーカー自体の直近のエラー (ヘルスチェック用)
+        self.browser_error = ""
+        self.error = ""
+
+    def _get_translator(self, spec: str | None) -> Translator | None:
+        if spec is None:
+            return None
+        if spec not in self.translators:
+            self.translators[spec] = create_translator(spec)
+        return self.translators[spec]
+
+    def _get_translation_memory(
+        self, translator: Translator | None
+    ) -> TranslationMemory | None:
+        if translator is None:
+            return None
+        key = translator.memory_key
+        if key not in self.translation_memories:
+            self.translation_memories[key] = TranslationMemory(key)
+        return self.translation_memories[key]
+
+    def health(self) -> dict:
+        """ワーカーとブラウザの状態を返す"""
+        return {
+            "worker_alive": self.is_alive(),
+            "worker_running": self.running,
+            "worker_restarts": self.restarts,
+            "browser_connected": self.browser is not None
+            and self.browser.is_connected(),
+            "browser_error": self.browser_error,
+            "error": self.error,
+        }
+
+    def run(self) -> None:
+        """ループが異常終了した場合は、待機時間を倍にしながら再起動し続ける"""
+        failures = 0
+        while True:
+            started_at = time.monotonic()
+            try:
+                asyncio.run(self._run())
+            except Exception as e:
+                self.error = f"ワーカーが停止しました: {e}"
+                print(self.error)
+            finally:
+                self.running = False
+                self.browser = None
+
+            # しばらく正常に動いていた場合は待機時間を戻す
+            if time.monotonic() - started_at > WORKER_RESTART_MAX_SEC:
+                failures = 0
+            wait = min(WORKER_RESTART_BASE_SEC * 2**failures, WORKER_RESTART_MAX_SEC)
+            failures += 1
+            self.restarts += 1
+            print(f"{wait:.0f}秒後にワーカーを再起動します。")
+            time.sleep(wait)
+
+    async def _run(self) -> None:
+        google_tts_client = create_google_tts_client()
+        async with async_playwright() as p:
+            await self._ensure_browser(p)
+            self.running = True
+            self.error = ""
+            print("ジョブを待機します。")
+            try:
+                while True:
+                    job = await asyncio.to_thread(self.queue.next_job)
+                    # 前のジョブでブラウザが落ちていれば起動し直す
+                    await self._ensure_browser(p)
+                    await self._run_job(job, self.browser, google_tts_client)
+            finally:
+                if self.browser is not None:
+                    await self.browser.close()
+
+    async def _ensure_browser(self, p) -> None:
+        """
+        ブラウザが起動していなければ起動する。
+        起動に失敗した場合は browser を None とし、スクレイピング時に WebScraper 側で再度起動を試みる。
+        """
+        if self.browser is not None and self.browser.is_connected():
+            return
+        try:
+            self.browser = await p.chromium.launch(headless=True)
+            self.browser_error = ""
+            print("ブラウザを起動しました。")
+        except Exception as e:
+            self.browser = None
+            self.browser_error = f"ブラウザの起動に失敗しました: {e}"
+            print(self.browser_error)
+
+    async def _run_job(self, job: Job, browser, google_tts_client) -> None:
+        print(f"ジョブを開始します: {job.id} ({job.url})")
+
+        html_content = None
+        if job.html_path:
+            with open(job.html_path, "r", encoding="utf-8") as f:
+                html_content = f.read()
+
+        def on_progress(stage: str, done: int, total: int) -> None:
+            self.queue.update_progress(job.id, stage, done, total)
+
+        try:
+            translator = self._get_translator(job.translator)
+            completed = await run_pipeline(
+                job.url,
+                html_content=html_content,
+                browser=browser,
+                google_tts_client=google_tts_client,
+                on_progress=on_progress,
+                tabs=job.tabs,
+                translator=translator,
+                translation_memory=self._get_translation_memory(translator),
+                workers=job.workers,
+            )
+        except JobCancelledError as e:
+            print(e)
+            self.queue.finish(job.id, JobStatus.CANCELLED)
+            return
+        except Exception as e:
+            print(f"ジョブが失敗しました: {job.id} ({e})")
+            self.queue.finish(job.id, JobStatus.FAILED, str(e))
+            return
+
+        if completed:
+            print(f"ジョブが完了しました: {job.id}")
+            self.queue.finish(job.id, JobStatus.DONE)
+        else:
+            self.queue.finish(job.id, JobStatus.FAILED, "処理が中断されました")
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """
+    ローカル用のJSON API
+      POST /jobs               {"url": ..., "priority": 0, "tabs": 1, "translator": null,
+                                "workers": 1, "html": "..."} でジョブ登録
+                               ("workers": "auto" で並列数を自動決定)
+                               (html は translator 指定時は元の英語のページ、それ以外は翻訳済みのページ)
+      GET  /jobs               ジョブ一覧
+      GET  /jobs/<id>          ジョブの状態と進捗
+      POST /jobs/<id>/cancel   ジョブのキャンセル
+      GET  /health             ワーカーとブラウザの状態 (ワーカーの再起動待ちの間は 503)
+    ワーカーのスレッド自体が終了している場合、ジョブ登録は 503 を返す。
+    再起動待ちの間に登録されたジョブはキューに残り、再起動後に処理される。
+    """
+
+    server: "JobServer"
+
+    def do_GET(self):
+        parts = self._path_parts()
+        if parts == ["health"]:
+            health = self.server.worker.health()
+            self._send_json(200 if health["worker_running"] else 503, health)
+        elif parts == ["jobs"]:
+            self._send_json(200, [job.to_dict() for job in self.server.queue.list()])
+        elif len(parts) == 2 and parts[0] == "jobs":
+            job = self.server.queue.get(parts[1])
+            if job is None:
+                self._send_json(404, {"error": "job not found"})
+            else:
+                self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        parts = self._path_parts()
+        if parts == ["jobs"]:
+            if not self.server.worker.is_alive():
+                self._send_json(503, self.server.worker.health())
+                return
+            try:
+                request = parse_job_request(self._read_json())
+            except (ValueError, KeyError, TypeError) as e:
+                self._send_json(400, {"error": f"invalid request: {e}"})
+                return
+            job = self.server.queue.submit(**request)
+            self._send_json(201, job.to_dict())
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "cancel":
+            job = self.server.queue.cancel(parts[1])
+            if job is None:
+                self._send_json(404, {"error": "job not found"})
+            else:
+                self._send_json(200, job.to_dict())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def _path_parts(self) -> list[str]:
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if not isinstance(body, dict):
+            raise ValueError("body must be a JSON object")
+        return body
+
+    def _send_json(self, status: int, data) -> None:
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def parse_job_request(body: dict) -> dict:
+    """
+    POST /jobs のリクエストを検証し、JobQueue.submit の引数に変換する。
+    不正な値の場合は ValueError / KeyError / TypeError を送出する。
+    """
+    url = body["url"]
+    html = body.get("html")
+    translator = body.get("translator")
+    for name, value in (("url", url), ("html", html), ("translator", translator)):
+        if value is not None and not isinstance(value, str):
+            raise TypeError(f"{name} must be a string")
+    if not url:
+        raise ValueError("url must not be empty")
+
+    tabs = int(body.get("tabs", 1))
+    if tabs < 1:
+        raise ValueError("tabs must be 1 or greater")
+
+    workers = body.get("workers", 1)
+    workers = None if workers == "auto" else int(workers)
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be 1 or greater, or \"auto\"")
+
+    return {
+        "url": url,
+        "priority": int(body.get("priority", 0)),
+        "html": html,
+        "tabs": tabs,
+        "translator": translator,
+        "workers": workers,
+    }
+
+
+class JobServer(ThreadingHTTPServer):
+    def __init__(self, address: tuple[str, int], queue: JobQueue, worker: JobWorker):
+        super().__init__(address, JobRequestHandler)
+        self.queue = queue
+        self.worker = worker
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+    """ジョブサーバーを起動し、Ctrl+C で停止するまで待ち受ける"""
+    queue = JobQueue()
+    worker = JobWorker(queue)
+    worker.start()
+
+    server = JobServer((host, port), queue, worker)
+    print(f"ジョブサーバーを起動しました: http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("ジョブサーバーを停止します。")
+    finally:
+        server.server_close()
@@ -1,31 +1,74 @@
+import io
 import os
+import time
+import wave
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pydub import AudioSegment
 import re
 from collections import Counter
 from .voicevox_client import VoicevoxClient
 from .file_manager import AudioFileManager
-from typing import List, Dict
+from .latency_model import LatencyModel
+from .rate_limiter import RateLimiter
+from typing import Callable, List, Dict
 from src.data_models.transcript_models import Transcript, Chapter, Segment, Role
 from google.cloud import texttospeech  # Google TTS import
-from src.constants import HOST_SPEAKER_NAMES  # 定数をインポート
+from google.api_core import exceptions as google_exceptions
+from src.constants import (  # 定数をインポート
+    GOOGLE_TTS_REQUESTS_PER_MINUTE,
+    HOST_SPEAKER_NAMES,
+)
+
+# クォータ超過 (429) 時の再試行回数と初回の待機秒数 (再試行ごとに倍にする)
+GOOGLE_TTS_MAX_RETRIES = 5
+GOOGLE_TTS_RETRY_BASE_SEC = 2.0
+
+
+def create_google_tts_client() -> texttospeech.TextToSpeechClient | None:
+    """Google TTS クライアントを生成します。失敗時は None を返します"""
+    # Google TTS Client (assuming GOOGLE_APPLICATION_CREDENTIALS env var is set)
+    try:
+        return texttospeech.TextToSpeechClient()
+    except Exception as e:
+        print(f"Failed to initialize Google TTS client: {e}")
+        print(
+            "Please ensure GOOGLE_APPLICATION_CREDENTIALS environment variable is set correctly."
+        )
+        return None
 
 
 class AudioSynthesizer:
 
-    def __init__(self, episode_name: str, podcast_name: str):
+    def __init__(
+        self,
+        episode_name: str,
+        podcast_name: str,
+        google_tts_client: texttospeech.TextToSpeechClient | None = None,
+        on_progress: Callable[[int, int], None] | None = None,
+        max_workers: int = 1,
+        latency_model: LatencyModel | None = None,
+    ):
         self.episode_name = episode_name
         self.podcast_name = podcast_name
         self.voicevox = VoicevoxClient()
         self.file_manager = AudioFileManager(episode_name, podcast_name)
-        # Google TTS Client (assuming GOOGLE_APPLICATION_CREDENTIALS env var is set)
-        try:
-            self.google_tts_client = texttospeech.TextToSpeechClient()
-        except Exception as e:
-            print(f"Failed to initialize Google TTS client: {e}")
-            print(
-                "Please ensure GOOGLE_APPLICATION_CREDENTIALS environment variable is set correctly."
-            )
-            self.google_tts_client = None
+        # 生成済みのクライアントが渡された場合は使い回す（常駐サーバー用）
+        self.google_tts_client = google_tts_client or create_google_tts_client()
+        # セグメント処理ごとに (処理済み数, 総数) で呼ばれる
+        self.on_progress = on_progress
+        self._done_segments = 0
+        self._total_segments = 0
+        # セグメントを並列に合成するスレッド数
+        self.max_workers = max(1, max_workers)
+        # リクエストごとの所要時間を記録し、plan モードの予測に使う
+        self.latency_model = latency_model or LatencyModel()
+        # 並列に合成してもクォータを超えないようにする
+        self.google_rate_limiter = RateLimiter(GOOGLE_TTS_REQUESTS_PER_MINUTE)
+        self._progress_lock = threading.Lock()
+        # 実際に同時に実行中のリクエスト数 (所要時間の実績に並列数として記録する)
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
 
         # 話者と音声のマッピングを保持する辞書
         self.speaker_voice_map: Dict[str, str] = {}
@@ -124,8 +167,8 @@ class AudioSynthesizer:
         )
 
         try:
-            response = self.google_tts_client.synthesize_speech(
-                input=synthesis_input, voice=voice, audio_config=audio_config
+            response, elapsed, concurrency = self._call_google_tts(
+                synthesis_input, voice, audio_config
             )
 
             with open(wav_output_path, "wb") as out:
@@ -137,24 +180,124 @@ class AudioSynthesizer:
                 f"Google TTS synthesis API failed. Text: {segment.text[:100]}... Error: {e}"
             )
 
-    def _process_segments(self, chapter: Chapter) -> None:
-        """チャプター内の各セグメントを処理します"""
+        self._record_latency(
+            "google", segment, elapsed, response.audio_content, concurrency
+        )
+
+    def _call_google_tts(self, synthesis_input, voice, audio_config):
+        """
+        レート制限を守って Google TTS を呼び出し、(レスポンス, 所要秒数, 並列数) を返します。
+        並列数は呼び出し開始時に実行中だったリクエスト数 (自身を含む) です。
+        クォータ超過の場合は待機時間を倍にしながら再試行します。
+        """
+        for attempt in range(GOOGLE_TTS_MAX_RETRIES + 1):
+            self.google_rate_limiter.acquire()
+            with self._in_flight_lock:
+                self._in_flight += 1
+                concurrency = self._in_flight
+            started_at = time.monotonic()
+            try:
+                response = self.google_tts_client.synthesize_speech(
+                    input=synthesis_input, voice=voice, audio_config=audio_config
+                )
+                return response, time.monotonic() - started_at, concurrency
+            except google_exceptions.ResourceExhausted:
+                if attempt == GOOGLE_TTS_MAX_RETRIES:
+                    raise
+                wait = GOOGLE_TTS_RETRY_BASE_SEC * 2**attempt
+                print(f"Google TTS quota exceeded. Retrying in {wait:.0f}s...")
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight -= 1
+            time.sleep(wait)
+
+    def _record_latency(
+        self,
+        engine: str,
+        segment: Segment,
+        elapsed: float,
+        audio_content: bytes,
+        concurrency: int,
+    ) -> None:
+        """所要時間の実績を記録します。記録に失敗しても合成は失敗扱いにしません"""
+        try:
+            self.latency_model.record(
+                engine,
+                len(segment.text),
+                elapsed,
+                _wav_duration_seconds(audio_content),
+                concurrency=concurrency,
+            )
+        except Exception as e:
+            print(f"所要時間の記録に失敗しました (合成は成功しています): {e}")
+
+    def _collect_pending_segments(self, chapter: Chapter) -> list[tuple[Segment, str]]:
+        """チャプター内で未生成のセグメントと出力先のパスを返します"""
+        pending = []
         for idx, segment in enumerate(chapter.segments):
             wav_output_path = self.file_manager.get_segment_path(chapter.no, idx)
 
             # ファイルが既に存在する場合はスキップ
             if os.path.exists(wav_output_path):
                 print(f"Skipping existing file: {wav_output_path}")
-                continue
+                self._report_progress()
+            else:
+                pending.append((segment, wav_output_path))
+        return pending
 
-            self._synthesize_segment_google(segment, wav_output_path)
+    def _process_chapters(self, chapters: list[Chapter]) -> None:
+        """
+        全チャプターのセグメントを合成し、チャプターごとに音声を結合します。
+        並列時はチャプターの境界で待たないよう、全チャプターのセグメントを1つのスレッドプールで処理し、
+        セグメントが揃ったチャプターから結合します。
+        """
+        pending_by_chapter = {}
+        for chapter in chapters:
+            os.makedirs(self.file_manager.get_chapter_dir(chapter.no), exist_ok=True)
+            pending_by_chapter[chapter.no] = self._collect_pending_segments(chapter)
 
-    def _process_chapter(self, chapter: Chapter) -> None:
-        """チャプターを処理します"""
-        chapter_dir = self.file_manager.get_chapter_dir(chapter.no)
-        os.makedirs(chapter_dir, exist_ok=True)
+        if self.max_workers == 1:
+            for chapter in chapters:
+                for segment, wav_output_path in pending_by_chapter[chapter.no]:
+                    self._synthesize_segment_google(segment, wav_output_path)
+                    self._report_progress()
+                self._concatenate_chapter(chapter)
+            return
+
+        remaining = {no: len(pending) for no, pending in pending_by_chapter.items()}
+        for chapter in chapters:
+            if remaining[chapter.no] == 0:
+                self._concatenate_chapter(chapter)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = {
+                executor.submit(self._synthesize_segment_google, segment, path): chapter
+                for chapter in chapters
+                for segment, path in pending_by_chapter[chapter.no]
+            }
+            for future in as_completed(futures):
+                future.result()
+                self._report_progress()
+                chapter = futures[future]
+                remaining[chapter.no] -= 1
+                if remaining[chapter.no] == 0:
+                    self._concatenate_chapter(chapter)
+        finally:
+            # 失敗・キャンセル時は未着手のセグメントを破棄する
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _report_progress(self) -> None:
+        """処理済みセグメント数を進捗コールバックへ通知します"""
+        with self._progress_lock:
+            self._done_segments += 1
+            done = self._done_segments
+        if self.on_progress:
+            self.on_progress(done, self._total_segments)
 
-        self._process_segments(chapter)
+    def _concatenate_chapter(self, chapter: Chapter) -> None:
+        """チャプターのセグメント音声を結合します"""
+        chapter_dir = self.file_manager.get_chapter_dir(chapter.no)
         self.file_manager.concatenate_chapter_audio(chapter, chapter_dir)
 
     def synthesize_from_transcript(self, transcript: Transcript) -> None:
@@ -162,5 +305,20 @@ class AudioSynthesizer:
 
         self._build_speaker_voice_map(transcript)
 
-        for chapter in transcript.chapters:
-            self._process_chapter(chapter)
+        self._done_segments = 0
+        self._total_segments = sum(
+            len(chapter.segments) for chapter in transcript.chapters
+        )
+        try:
+            self._process_chapters(transcript.chapters)
+        finally:
+            try:
+                self.latency_model.save()
+            except Exception as e:
+                print(f"所要時間の実績の保存に失敗しました: {e}")
+
+
+def _wav_duration_seconds(audio_content: bytes) -> float:
+    """WAVデータの再生時間(秒)を返します"""
+    with wave.open(io.BytesIO(audio_content), "rb") as wav_file:
+        return wav_file.getnframes() / wav_file.getframerate()
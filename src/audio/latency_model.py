@@ -0,0 +1,186 @@
+import os
+import json
+import threading
+from src.utils.utils import save_json
+
+DEFAULT_MODEL_PATH = os.path.join("output", "data", "latency_model.json")
+
+# 記録するサンプル数の上限 (古いものから捨てる)
+MAX_SAMPLES = 1000
+
+# 実績が無い場合の想定値
+DEFAULT_BASE_SEC = 0.5
+DEFAULT_SEC_PER_CHAR = 0.005
+# 日本語の読み上げ速度 (約350文字/分)
+DEFAULT_AUDIO_SEC_PER_CHAR = 60 / 350
+
+# 並列数による遅延の増加は Universal Scalability Law で表す
+#   遅延(c) ∝ 1 + CONTENTION * (c - 1) + COHERENCY * c * (c - 1)
+# 実績が足りない場合の想定値 (並列数 10 前後でスループットが頭打ちになる程度)
+DEFAULT_CONTENTION = 0.1
+DEFAULT_COHERENCY = 0.005
+
+
+class LatencyModel:
+    """
+    エンジンごとに 文字数・並列数 -> リクエスト所要時間・音声の長さ の実績を記録し、予測する。
+    所要時間は最も低い並列数の実績に1次式を当てはめ、他の並列数の実績から並列化による遅延の増加を推定する。
+    実績はJSONファイルに永続化する。
+    """
+
+    def __init__(self, file_path: str = DEFAULT_MODEL_PATH):
+        self.file_path = file_path
+        # {engine: [[文字数, 所要秒数, 音声秒数, 並列数], ...]}
+        self.samples: dict[str, list[list[float]]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(file_path):
+            with open(file_path, "r", encoding="utf-8") as f:
+                self.samples = json.load(f)
+
+    def record(
+        self,
+        engine: str,
+        chars: int,
+        seconds: float,
+        audio_seconds: float,
+        concurrency: int = 1,
+    ) -> None:
+        with self._lock:
+            samples = self.samples.setdefault(engine, [])
+            samples.append([chars, seconds, audio_seconds, concurrency])
+            del samples[:-MAX_SAMPLES]
+
+    def save(self) -> None:
+        with self._lock:
+            save_json(self.samples, self.file_path)
+
+    def sample_count(self, engine: str) -> int:
+        return len(self.samples.get(engine, []))
+
+    def observed_concurrency(self, engine: str) -> list[int]:
+        """実績のある並列数の一覧を返します"""
+        return sorted(self._by_concurrency(engine))
+
+    def predict_seconds(self, engine: str, chars: int, concurrency: int = 1) -> float:
+        """指定の並列数で実行したときの1リクエストの所要時間を予測します"""
+        return self.predict_total_seconds(engine, [chars], concurrency)
+
+    def predict_total_seconds(
+        self, engine: str, lengths: list[int], concurrency: int = 1
+    ) -> float:
+        """指定の並列数で実行したときの、各リクエストの所要時間の合計を予測します"""
+        base, per_char = self._coefficients(engine, concurrency)
+        return base * len(lengths) + per_char * sum(lengths)
+
+    def _coefficients(self, engine: str, concurrency: int) -> tuple[float, float]:
+        """指定の並列数での 所要秒数 = 切片 + 傾き * 文字数 の係数を返します"""
+        by_concurrency = self._by_concurrency(engine)
+        if not by_concurrency:
+            scale = _usl(concurrency, DEFAULT_CONTENTION, DEFAULT_COHERENCY)
+            return DEFAULT_BASE_SEC * scale, DEFAULT_SEC_PER_CHAR * scale
+
+        # 基準とする並列数: サンプルが2件以上ある最小の並列数 (無ければ最小の並列数)
+        reference = min(
+            (level for level, samples in by_concurrency.items() if len(samples) >= 2),
+            default=min(by_concurrency),
+        )
+        base, per_char = _fit_line(by_concurrency[reference])
+        contention, coherency = _fit_contention(by_concurrency, reference, base, per_char)
+
+        scale = _usl(concurrency, contention, coherency) / _usl(
+            reference, contention, coherency
+        )
+        return base * scale, per_char * scale
+
+    def predict_audio_seconds(self, engine: str, chars: int) -> float:
+        """生成される音声の長さを予測します"""
+        samples = self.samples.get(engine, [])
+        total_chars = sum(sample[0] for sample in samples)
+        if total_chars == 0:
+            return DEFAULT_AUDIO_SEC_PER_CHAR * chars
+        return sum(sample[2] for sample in samples) / total_chars * chars
+
+    def _by_concurrency(self, engine: str) -> dict[int, list[list[float]]]:
+        """並列数ごとにサンプルをまとめます (並列数の無い古いサンプルは 1 とみなす)"""
+        groups: dict[int, list[list[float]]] = {}
+        for sample in self.samples.get(engine, []):
+            level = int(sample[3]) if len(sample) > 3 else 1
+            groups.setdefault(level, []).append(sample)
+        return groups
+
+
+def _usl(concurrency: int, contention: float, coherency: float) -> float:
+    """並列数 1 を基準とした遅延の倍率"""
+    return 1 + contention * (concurrency - 1) + coherency * concurrency * (concurrency - 1)
+
+
+def _fit_line(samples: list[list[float]]) -> tuple[float, float]:
+    """最小二乗法で 所要秒数 = 切片 + 傾き * 文字数 を当てはめます"""
+    if len(samples) < 2:
+        if samples:
+            # 1件だけの場合は文字数あたりの傾きを想定値とし、切片で合わせる
+            chars, seconds = samples[0][0], samples[0][1]
+            return max(0.0, seconds - DEFAULT_SEC_PER_CHAR * chars), DEFAULT_SEC_PER_CHAR
+        return DEFAULT_BASE_SEC, DEFAULT_SEC_PER_CHAR
+
+    n = len(samples)
+    mean_x = sum(sample[0] for sample in samples) / n
+    mean_y = sum(sample[1] for sample in samples) / n
+    var_x = sum((sample[0] - mean_x) ** 2 for sample in samples)
+    if var_x == 0:
+        return mean_y, 0.0
+    slope = sum(
+        (sample[0] - mean_x) * (sample[1] - mean_y) for sample in samples
+    ) / var_x
+    slope = max(0.0, slope)
+    return max(0.0, mean_y - slope * mean_x), slope
+
+
+def _fit_contention(
+    by_concurrency: dict[int, list[list[float]]],
+    reference: int,
+    base: float,
+    per_char: float,
+) -> tuple[float, float]:
+    """
+    基準の並列数に対する各並列数の遅延の倍率から、USL の係数 (contention, coherency) を求めます。
+    倍率 r(L) = usl(L) / usl(基準) は係数について1次式になるため、最小二乗法で解きます。
+    """
+    rows = []
+    for level, samples in by_concurrency.items():
+        if level == reference:
+            continue
+        predicted = sum(base + per_char * sample[0] for sample in samples)
+        if predicted <= 0:
+            continue
+        ratio = sum(sample[1] for sample in samples) / predicted
+        rows.append(
+            (
+                (level - 1) - ratio * (reference - 1),
+                level * (level - 1) - ratio * reference * (reference - 1),
+                ratio - 1,
+            )
+        )
+
+    if not rows:
+        return DEFAULT_CONTENTION, DEFAULT_COHERENCY
+
+    if len(rows) >= 2:
+        s11 = sum(x1 * x1 for x1, _, _ in rows)
+        s12 = sum(x1 * x2 for x1, x2, _ in rows)
+        s22 = sum(x2 * x2 for _, x2, _ in rows)
+        t1 = sum(x1 * y for x1, _, y in rows)
+        t2 = sum(x2 * y for _, x2, y in rows)
+        det = s11 * s22 - s12 * s12
+        if abs(det) > 1e-9:
+            contention = (t1 * s22 - t2 * s12) / det
+            coherency = (s11 * t2 - s12 * t1) / det
+            return max(0.0, contention), max(0.0, coherency)
+
+    # 式が足りない場合は coherency を想定値に固定して contention だけ求める
+    coherency = DEFAULT_COHERENCY
+    s11 = sum(x1 * x1 for x1, _, _ in rows)
+    if s11 == 0:
+        return DEFAULT_CONTENTION, coherency
+    contention = sum(x1 * (y - coherency * x2) for x1, x2, y in rows) / s11
+    return max(0.0, contention), coherency
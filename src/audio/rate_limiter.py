@@ -0,0 +1,20 @@
+import time
+import threading
+
+
+class RateLimiter:
+    """1分あたりのリクエスト数を超えないよう、リクエストの間隔を均等に空ける (スレッドセーフ)"""
+
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60 / requests_per_minute
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """次のリクエストを送ってよい時刻まで待機します"""
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
@@ -1 +1,10 @@
-HOST_SPEAKER_NAMES = ("レックス・フリードマン", "レックス")
\ No newline at end of file
+HOST_SPEAKER_NAMES = ("レックス・フリードマン", "レックス")
+# 翻訳バックエンドを使う場合、ホストの話者名は翻訳せずにこの対応で置き換える
+# (preprocess で HOST_SPEAKER_NAMES と完全一致させるため)
+HOST_SPEAKER_NAME_TRANSLATIONS = {
+    "Lex Fridman": "レックス・フリードマン",
+    "Lex": "レックス",
+}
+
+# Google TTS の1分あたりのリクエスト数の上限 (既定のクォータ)
+GOOGLE_TTS_REQUESTS_PER_MINUTE = 1000
@@ -0,0 +1,27 @@
+import requests
+
+
+class HttpFetcher:
+    """ ブラウザを使わずにHTTPで元の(英語の)ページを取得する """
+
+    USER_AGENT = "Mozilla/5.0 (compatible; tts-playwright-bs4)"
+    TIMEOUT_SEC = 30
+
+    def __init__(self, url):
+        self.url = url
+        self.page_content = None
+
+    def fetch_content(self):
+        """ ページのHTMLを取得。失敗時は requests の例外をそのまま伝播する """
+        print(f"HTTPでページを取得しています: {self.url}")
+        response = requests.get(
+            self.url, headers={"User-Agent": self.USER_AGENT}, timeout=self.TIMEOUT_SEC
+        )
+        response.raise_for_status()
+        response.encoding = response.encoding or "utf-8"
+        self.page_content = response.text
+        print("ページ取得処理完了")
+
+    def get_content(self):
+        """ 取得したHTMLを返す """
+        return self.page_content
@@ -1,4 +1,5 @@
 from bs4 import BeautifulSoup
+from collections import Counter
 import urllib.parse
 
 class HTMLParser:
@@ -54,3 +55,96 @@ class HTMLParser:
                 current_chapter["segments"].append(segment)
 
         return results
+
+
+def group_chapters(soup):
+    """ チャプターID -> (見出しの h2 要素, そのチャプターに属する ts-segment 要素のリスト) を返す """
+    content_div = soup.find('div', class_='entry-content')
+    if not content_div:
+        return {}
+
+    groups = {}
+    current_id = None
+    for elem in content_div.find_all(True):
+        if elem.name == 'h2' and elem.has_attr('id') and elem['id'].startswith('chapter'):
+            current_id = elem['id']
+            groups[current_id] = (elem, [])
+        elif current_id and elem.name == 'div' and 'ts-segment' in elem.get('class', []):
+            groups[current_id][1].append(elem)
+    return groups
+
+
+def split_chapter_ranges(chapters, scroll_height, tabs):
+    """
+    [(チャプターID, 位置)] をページ上の高さがほぼ均等になるよう連続した範囲に分割する。
+    空の範囲は除く。
+    """
+    if not chapters or tabs <= 1:
+        return [[chapter_id for chapter_id, _ in chapters]]
+
+    start = chapters[0][1]
+    span = max(1, scroll_height - start) / tabs
+    ranges = [[] for _ in range(tabs)]
+    for chapter_id, top in chapters:
+        ranges[min(tabs - 1, int((top - start) / span))].append(chapter_id)
+    return [r for r in ranges if r]
+
+
+def merge_chapter_ranges(html_contents, chapter_ranges):
+    """
+    タブごとに取得したHTMLから、各タブが担当したチャプターの見出しとセグメントを集めて1つのHTMLにまとめる。
+    すべての見出し・セグメントがちょうど1回ずつ、担当タブから採用されたことを確認し、
+    そうでなければ ValueError を送出する。
+    """
+    base = BeautifulSoup(html_contents[0], 'html.parser')
+    base_groups = group_chapters(base)
+
+    owners = Counter(chapter_id for ids in chapter_ranges for chapter_id in ids)
+    duplicated = [chapter_id for chapter_id, count in owners.items() if count > 1]
+    missing = [chapter_id for chapter_id in base_groups if chapter_id not in owners]
+    if duplicated or missing:
+        raise ValueError(
+            f"チャプターの分担が不正です (重複: {duplicated}, 未担当: {missing})"
+        )
+
+    # チャプターID -> 担当タブの (見出し, セグメント) 要素
+    expected = {}
+    for tab_no, (html, chapter_ids) in enumerate(zip(html_contents, chapter_ranges)):
+        tab_groups = base_groups if tab_no == 0 else group_chapters(
+            BeautifulSoup(html, 'html.parser')
+        )
+        for chapter_id in chapter_ids:
+            if chapter_id not in base_groups or chapter_id not in tab_groups:
+                raise ValueError(
+                    f"タブ{tab_no + 1}にチャプター '{chapter_id}' が見つかりません"
+                )
+            base_heading, base_segments = base_groups[chapter_id]
+            tab_heading, tab_segments = tab_groups[chapter_id]
+            if len(base_segments) != len(tab_segments):
+                raise ValueError(
+                    f"タブ{tab_no + 1}のチャプター '{chapter_id}' のセグメント数が一致しません"
+                )
+            if tab_no != 0:
+                base_heading.replace_with(tab_heading)
+                for base_segment, tab_segment in zip(base_segments, tab_segments):
+                    base_segment.replace_with(tab_segment)
+            expected[chapter_id] = (tab_heading, tab_segments)
+
+    # 結合後の文書を走査し直し、各要素が担当タブのものになっていることを確認する
+    merged_groups = group_chapters(base)
+    if merged_groups.keys() != expected.keys():
+        raise ValueError("結合後のチャプター構成が元のページと一致しません")
+    for chapter_id, (heading, segments) in merged_groups.items():
+        expected_heading, expected_segments = expected[chapter_id]
+        if heading is not expected_heading:
+            raise ValueError(
+                f"チャプター '{chapter_id}' の見出しが担当タブのものではありません"
+            )
+        if len(segments) != len(expected_segments) or any(
+            segment is not expected_segment
+            for segment, expected_segment in zip(segments, expected_segments)
+        ):
+            raise ValueError(
+                f"チャプター '{chapter_id}' のセグメントが担当タブのものと一致しません"
+            )
+    return str(base)
@@ -1,54 +1,137 @@
 from playwright.async_api import async_playwright
 import asyncio
+from src.parsing.parser import merge_chapter_ranges, split_chapter_ranges
+
+# 指定IDの要素のページ上端からの位置を返す（見つからない場合はページの高さ）
+_ELEMENT_TOP_JS = """(id) => {
+    const elem = id ? document.getElementById(id) : null;
+    return elem
+        ? elem.getBoundingClientRect().top + window.scrollY
+        : document.body.scrollHeight;
+}"""
+
+_CHAPTER_IDS_JS = """() => Array.from(
+    document.querySelectorAll('.entry-content h2[id^=chapter]'),
+    (elem) => [elem.id, elem.getBoundingClientRect().top + window.scrollY]
+)"""
+
 
 class WebScraper:
-    def __init__(self, url):
+    def __init__(self, url, browser=None, tabs=1):
         self.url = url
+        # 起動済みのブラウザを渡すと使い回す（常駐サーバー用）
+        self.browser = browser
+        # 2以上の場合はチャプター範囲ごとに複数タブで並列にスクロールする
+        self.tabs = max(1, tabs)
         self.page_content = None
 
     async def fetch_content(self):
         """ Playwrightを使って翻訳ページからHTMLを取得 """
         print("ページ取得を開始しています...")
+        if self.browser is not None:
+            await self._fetch_with_browser(self.browser)
+            return
+
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto(self.url)
-
-            # 初期のテキストが読み込まれるのを待機
-            await page.wait_for_selector('.entry-content', timeout=10000)
-
-            # 最下部までスクロールして翻訳を促す
-            # await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
-
-            # ゆっくりスクロール（翻訳がすべての要素にかかるように）
-            scroll_height = await page.evaluate("document.body.scrollHeight")
-            current_position = 0
-            scroll_step = 100
-            delay_ms = 100
-            progress_counter = 0
-
-            while current_position < scroll_height:
-                await page.evaluate(f"window.scrollTo(0, {current_position})")
-                current_position += scroll_step
-                await asyncio.sleep(delay_ms / 1000)
-
-                # 1秒ごとに進捗を表示
-                progress_counter += delay_ms
-                if progress_counter >= 1000:
-                    progress_percent = min(100, int((current_position / scroll_height) * 100))
-                    print(f"...処理中です ({progress_percent}%)")
-                    progress_counter = 0
-
-            print("ページ取得処理完了")
-            await asyncio.sleep(1.5)
-            await page.wait_for_timeout(3000)  # 翻訳が実行されるまで少し待つ
-
-            # .entry-content のHTMLを取得
-            # await page.wait_for_selector('.entry-content', timeout=10000)
-            # self.page_content = await page.inner_html('.entry-content')
-            self.page_content = await page.content()
-
-            await browser.close()
+            try:
+                await self._fetch_with_browser(browser)
+            finally:
+                await browser.close()
+
+    async def _fetch_with_browser(self, browser):
+        """ 指定ブラウザで新しいページを開き、スクロールして翻訳後のHTMLを取得 """
+        pages = [await browser.new_page() for _ in range(self.tabs)]
+        try:
+            await asyncio.gather(*(self._open_page(page) for page in pages))
+
+            chapters = await pages[0].evaluate(_CHAPTER_IDS_JS)
+            scroll_height = await pages[0].evaluate("document.body.scrollHeight")
+            chapter_ranges = split_chapter_ranges(chapters, scroll_height, self.tabs)
+
+            if len(chapter_ranges) <= 1:
+                # 1タブの場合（またはチャプターが分割できない場合）はページ全体をスクロール
+                await self._scroll_range(pages[0], None, None, "")
+                self.page_content = await self._capture(pages[0])
+                return
+
+            print(f"{len(chapter_ranges)}個のタブでチャプターを分担して取得します")
+            next_ids = [r[0] for r in chapter_ranges[1:]] + [None]
+            contents = await asyncio.gather(
+                *(
+                    self._scroll_and_capture(page, ids[0], next_id, f"タブ{i + 1}: ")
+                    for i, (page, ids, next_id) in enumerate(
+                        zip(pages, chapter_ranges, next_ids)
+                    )
+                )
+            )
+            self.page_content = merge_chapter_ranges(contents, chapter_ranges)
+        finally:
+            for page in pages:
+                await page.close()
+
+    async def _open_page(self, page):
+        """ 翻訳ページを開き、初期のテキストが読み込まれるのを待機 """
+        await page.goto(self.url)
+        await page.wait_for_selector('.entry-content', timeout=10000)
+
+    async def _scroll_and_capture(self, page, start_id, end_id, label):
+        await self._scroll_range(page, start_id, end_id, label)
+        return await self._capture(page)
+
+    async def _scroll_range(self, page, start_id, end_id, label):
+        """
+        start_id の要素から end_id の要素までゆっくりスクロールする（翻訳がすべての要素にかかるように）。
+        None の場合はそれぞれページ先頭・末尾を表す。
+        """
+        # 最下部までスクロールして翻訳を促す
+        # await page.evaluate("() => window.scrollTo(0, document.body.scrollHeight)")
+
+        current_position = (
+            int(await page.evaluate(_ELEMENT_TOP_JS, start_id)) if start_id else 0
+        )
+        start_position = current_position
+        # 境界のセグメントも確実に表示されるよう1画面分余分にスクロールする
+        margin = await page.evaluate("window.innerHeight") if end_id else 0
+        scroll_step = 100
+        delay_ms = 100
+        progress_counter = 0
+
+        while True:
+            # 翻訳によってレイアウトが変わるため終端位置は毎回取り直す
+            end_position = await page.evaluate(_ELEMENT_TOP_JS, end_id) + margin
+            if current_position >= end_position:
+                break
+
+            await page.evaluate(f"window.scrollTo(0, {current_position})")
+            current_position += scroll_step
+            await asyncio.sleep(delay_ms / 1000)
+
+            # 1秒ごとに進捗を表示
+            progress_counter += delay_ms
+            if progress_counter >= 1000:
+                progress_percent = min(
+                    100,
+                    int(
+                        (current_position - start_position)
+                        / max(1, end_position - start_position)
+                        * 100
+                    ),
+                )
+                print(f"...{label}処理中です ({progress_percent}%)")
+                progress_counter = 0
+
+        print(f"{label}ページ取得処理完了")
+
+    async def _capture(self, page):
+        """ 翻訳の反映を待ってからHTMLを取得 """
+        await asyncio.sleep(1.5)
+        await page.wait_for_timeout(3000)  # 翻訳が実行されるまで少し待つ
+
+        # .entry-content のHTMLを取得
+        # await page.wait_for_selector('.entry-content', timeout=10000)
+        # return await page.inner_html('.entry-content')
+        return await page.content()
 
     def get_content(self):
         """ 取得したHTMLを返す """
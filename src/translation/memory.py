@@ -0,0 +1,35 @@
+import os
+import json
+import threading
+from src.utils.utils import save_json
+
+MEMORY_DIR = os.path.join("output", "data", "translation_memory")
+
+
+class TranslationMemory:
+    """
+    原文 -> 訳文 の対応をJSONファイルに永続化し、同じ文を再翻訳しないようにする。
+    翻訳バックエンドごとに別のファイルを使い、異なるバックエンドの訳文が混ざらないようにする。
+    """
+
+    def __init__(self, key: str, file_path: str | None = None):
+        self.key = key
+        self.file_path = file_path or os.path.join(MEMORY_DIR, f"{key}.json")
+        self._entries: dict[str, str] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(self.file_path):
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+            print(f"翻訳メモリを読み込みました: {self.file_path} ({len(self._entries)}件)")
+
+    def get(self, text: str) -> str | None:
+        with self._lock:
+            return self._entries.get(text)
+
+    def update(self, translations: dict[str, str]) -> None:
+        with self._lock:
+            self._entries.update(translations)
+
+    def save(self) -> None:
+        with self._lock:
+            save_json(self._entries, self.file_path)
@@ -0,0 +1,191 @@
+import os
+import json
+import hashlib
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+from src.constants import HOST_SPEAKER_NAME_TRANSLATIONS
+from src.translation.memory import TranslationMemory
+
+# 1リクエストあたりの文の数と文字数の上限
+# (Cloud Translation は1リクエスト5,000文字程度までが推奨)
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_BATCH_CHARS = 5000
+
+
+class Translator(ABC):
+    """翻訳バックエンドの共通インターフェース"""
+
+    @property
+    @abstractmethod
+    def memory_key(self) -> str:
+        """翻訳メモリのファイルを分けるための、バックエンドと翻訳先言語を表す名前"""
+
+    @abstractmethod
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        """英語の文のリストを、同じ順序の日本語訳のリストに変換します"""
+
+
+class FileTranslator(Translator):
+    """JSONファイルの 原文 -> 訳文 の対応表で翻訳する (テスト・オフライン用)"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, "r", encoding="utf-8") as f:
+            self.table: Dict[str, str] = json.load(f)
+
+    @property
+    def memory_key(self) -> str:
+        # 同名の別ファイルと混ざらないよう絶対パスのハッシュを付ける
+        digest = hashlib.sha1(os.path.abspath(self.file_path).encode("utf-8")).hexdigest()
+        stem = os.path.splitext(os.path.basename(self.file_path))[0]
+        return f"file-{stem}-{digest[:8]}"
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        missing = [text for text in texts if text not in self.table]
+        if missing:
+            raise ValueError(
+                f"翻訳表に存在しない文があります ({len(missing)}件): {missing[0][:50]}..."
+            )
+        return [self.table[text] for text in texts]
+
+
+class GoogleCloudTranslator(Translator):
+    """Google Cloud Translation API (v2) で翻訳する"""
+
+    def __init__(self, target_language: str = "ja"):
+        try:
+            from google.cloud import translate_v2
+        except ImportError as e:
+            raise RuntimeError(
+                "google-cloud-translate がインストールされていません。"
+                "pip install google-cloud-translate を実行してください。"
+            ) from e
+        self.client = translate_v2.Client()
+        self.target_language = target_language
+
+    @property
+    def memory_key(self) -> str:
+        return f"google-{self.target_language}"
+
+    def translate_batch(self, texts: List[str]) -> List[str]:
+        results = self.client.translate(
+            texts,
+            source_language="en",
+            target_language=self.target_language,
+            format_="text",
+        )
+        return [result["translatedText"] for result in results]
+
+
+def create_translator(spec: str) -> Translator:
+    """
+    文字列指定から翻訳バックエンドを生成します。
+      "google"       : Google Cloud Translation API
+      "file:<path>"  : JSONの対応表
+    """
+    if spec == "google":
+        return GoogleCloudTranslator()
+    if spec.startswith("file:"):
+        return FileTranslator(spec[len("file:"):])
+    raise ValueError(f"不明な翻訳バックエンドです: {spec}")
+
+
+def translate_transcript_data(
+    transcript_data: List[Dict[str, Any]],
+    translator: Translator,
+    memory: TranslationMemory,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batch_chars: int = DEFAULT_MAX_BATCH_CHARS,
+    max_workers: int = 4,
+) -> List[Dict[str, Any]]:
+    """
+    HTMLParser で抽出した英語のチャプター構造のタイトル・話者・本文を翻訳します。
+    翻訳メモリにない文だけをまとめてバッチに分け、並列に翻訳します。
+    ホストの話者名は翻訳せず HOST_SPEAKER_NAME_TRANSLATIONS の対応で置き換えます。
+    """
+    if memory.key != translator.memory_key:
+        raise ValueError(
+            f"翻訳メモリ ({memory.key}) と翻訳バックエンド ({translator.memory_key}) が一致しません"
+        )
+
+    texts = []
+    for chapter in transcript_data:
+        texts.append(chapter["title"])
+        for segment in chapter["segments"]:
+            texts.extend([segment["speaker"], segment["text"]])
+
+    # 重複と空文字・固定の話者名を除き、メモリにある文は翻訳しない
+    unique_texts = [
+        text
+        for text in dict.fromkeys(texts)
+        if text and text not in HOST_SPEAKER_NAME_TRANSLATIONS
+    ]
+    pending = [text for text in unique_texts if memory.get(text) is None]
+    print(
+        f"翻訳対象: {len(pending)}件 "
+        f"(全{len(unique_texts)}件中、翻訳メモリのヒット {len(unique_texts) - len(pending)}件)"
+    )
+
+    batches = _split_batches(pending, batch_size, max_batch_chars)
+
+    def translate(batch: List[str]) -> None:
+        translated = translator.translate_batch(batch)
+        if len(translated) != len(batch):
+            raise RuntimeError(
+                f"翻訳結果の件数が一致しません (入力 {len(batch)}件, 出力 {len(translated)}件)"
+            )
+        memory.update(dict(zip(batch, translated)))
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # list() で各バッチの例外を呼び出し元へ伝播させる
+            list(executor.map(translate, batches))
+    finally:
+        # 途中で失敗しても翻訳済みの分は保存しておく
+        if batches:
+            memory.save()
+
+    def lookup(text: str) -> str:
+        if text in HOST_SPEAKER_NAME_TRANSLATIONS:
+            return HOST_SPEAKER_NAME_TRANSLATIONS[text]
+        return memory.get(text) if text else text
+
+    return [
+        {
+            **chapter,
+            "title": lookup(chapter["title"]),
+            "segments": [
+                {
+                    **segment,
+                    "speaker": lookup(segment["speaker"]),
+                    "text": lookup(segment["text"]),
+                }
+                for segment in chapter["segments"]
+            ],
+        }
+        for chapter in transcript_data
+    ]
+
+
+def _split_batches(
+    texts: List[str], batch_size: int, max_batch_chars: int
+) -> List[List[str]]:
+    """
+    文の数が batch_size、合計文字数が max_batch_chars を超えないようにバッチへ分割します。
+    1文だけで上限を超える場合はその文だけのバッチにします。
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_chars = 0
+    for text in texts:
+        if current and (
+            len(current) >= batch_size or current_chars + len(text) > max_batch_chars
+        ):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
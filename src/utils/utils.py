@@ -4,10 +4,15 @@ from urllib.parse import urlparse
 
 
 def save_json(data, filename):
-    """データを指定パスにJSON形式で保存する。失敗時は例外をそのまま伝播する"""
+    """
+    データを指定パスにJSON形式で保存する。失敗時は例外をそのまま伝播する。
+    一時ファイルに書き出してから置き換えるため、書き込み途中で停止しても既存ファイルは壊れない。
+    """
     os.makedirs(os.path.dirname(filename), exist_ok=True)
-    with open(filename, "w", encoding="utf-8") as f:
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_filename, filename)
     return filename
 
 
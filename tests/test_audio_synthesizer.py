@@ -0,0 +1,113 @@
+import io
+import threading
+import time
+import wave
+import pytest
+from src.audio.audio_synthesizer import AudioSynthesizer
+from src.audio.latency_model import LatencyModel
+from src.audio.rate_limiter import RateLimiter
+from src.data_models.transcript_models import Chapter, Role, Segment, Transcript
+
+
+def _wav_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(24000)
+        wav_file.writeframes(b"\x00\x00" * 2400)
+    return buffer.getvalue()
+
+
+class FakeGoogleClient:
+    """同時に実行中のリクエスト数の最大値を記録する Google TTS のスタブ"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def synthesize_speech(self, input, voice, audio_config):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        return type("Response", (), {"audio_content": _wav_bytes()})()
+
+
+def _transcript(chapter_count, segments_per_chapter):
+    chapters = [
+        Chapter(
+            no=str(no),
+            title="title",
+            segments=[
+                Segment("speaker", "あ" * 10, Role.GUEST)
+                for _ in range(segments_per_chapter)
+            ],
+        )
+        for no in range(chapter_count)
+    ]
+    return Transcript(chapters=chapters, episode_name="episode_preprocessed")
+
+
+@pytest.fixture
+def synthesizer_factory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def create(client, max_workers):
+        synthesizer = AudioSynthesizer(
+            "episode",
+            "podcast",
+            google_tts_client=client,
+            max_workers=max_workers,
+            latency_model=LatencyModel(str(tmp_path / "latency.json")),
+        )
+        synthesizer.google_rate_limiter = RateLimiter(600_000)
+        concatenated = []
+        monkeypatch.setattr(
+            synthesizer.file_manager,
+            "concatenate_chapter_audio",
+            lambda chapter, chapter_dir: concatenated.append(chapter.no),
+        )
+        return synthesizer, concatenated
+
+    return create
+
+
+def test_parallel_synthesis_does_not_wait_at_chapter_boundaries(synthesizer_factory):
+    # 1チャプターあたりのセグメント数が並列数より少なくても、並列数いっぱいまで同時に実行する
+    client = FakeGoogleClient()
+    synthesizer, concatenated = synthesizer_factory(client, max_workers=8)
+
+    synthesizer.synthesize_from_transcript(_transcript(8, 2))
+
+    assert client.max_in_flight == 8
+    assert sorted(concatenated, key=int) == [str(no) for no in range(8)]
+    levels = synthesizer.latency_model.observed_concurrency("google")
+    assert max(levels) == 8
+
+
+def test_recorded_concurrency_is_requests_in_flight(synthesizer_factory):
+    client = FakeGoogleClient(delay=0.0)
+    synthesizer, concatenated = synthesizer_factory(client, max_workers=1)
+
+    synthesizer.synthesize_from_transcript(_transcript(2, 3))
+
+    assert synthesizer.latency_model.observed_concurrency("google") == [1]
+    assert concatenated == ["0", "1"]
+
+
+def test_chapters_with_existing_segments_are_concatenated(synthesizer_factory):
+    client = FakeGoogleClient(delay=0.0)
+    synthesizer, concatenated = synthesizer_factory(client, max_workers=4)
+    transcript = _transcript(3, 2)
+    synthesizer.synthesize_from_transcript(transcript)
+    concatenated.clear()
+
+    synthesizer.synthesize_from_transcript(transcript)
+
+    assert sorted(concatenated) == ["0", "1", "2"]
+    assert synthesizer.latency_model.sample_count("google") == 6
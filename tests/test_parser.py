@@ -0,0 +1,102 @@
+import pytest
+from src.parsing.parser import (
+    HTMLParser,
+    merge_chapter_ranges,
+    split_chapter_ranges,
+)
+
+CHAPTER_SEGMENTS = [2, 1, 3]
+
+
+def _page(translated_chapters, segment_counts=CHAPTER_SEGMENTS):
+    """translated_chapters に含まれるチャプターだけ翻訳済み (JA) になったページを作る"""
+    parts = ['<html><body><div class="entry-content"><p>intro</p>']
+    for no, count in enumerate(segment_counts):
+        lang = "JA" if no in translated_chapters else "EN"
+        parts.append(f'<h2 id="chapter{no}_x">{lang} title {no}</h2>')
+        for idx in range(count):
+            parts.append(
+                '<div class="ts-segment">'
+                f'<span class="ts-name">{lang} speaker</span>'
+                f'<span class="ts-text">{lang} text {no}-{idx}</span>'
+                "</div>"
+            )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+RANGES = [["chapter0_x"], ["chapter1_x"], ["chapter2_x"]]
+
+
+def test_merge_takes_headings_and_segments_from_owning_tab():
+    contents = [_page({0}), _page({1}), _page({2})]
+
+    merged = HTMLParser(merge_chapter_ranges(contents, RANGES))
+    chapters = merged.extract_conversation_structure()
+
+    assert [chapter["title"] for chapter in chapters] == [
+        "JA title 0",
+        "JA title 1",
+        "JA title 2",
+    ]
+    texts = [segment["text"] for chapter in chapters for segment in chapter["segments"]]
+    assert texts == [
+        "JA text 0-0",
+        "JA text 0-1",
+        "JA text 1-0",
+        "JA text 2-0",
+        "JA text 2-1",
+        "JA text 2-2",
+    ]
+
+
+def test_merge_rejects_chapter_owned_twice():
+    contents = [_page({0}), _page({1}), _page({2})]
+    ranges = [["chapter0_x", "chapter1_x"], ["chapter1_x"], ["chapter2_x"]]
+
+    with pytest.raises(ValueError, match="重複"):
+        merge_chapter_ranges(contents, ranges)
+
+
+def test_merge_rejects_unowned_chapter():
+    contents = [_page({0}), _page({1})]
+    ranges = [["chapter0_x"], ["chapter1_x"]]
+
+    with pytest.raises(ValueError, match="未担当"):
+        merge_chapter_ranges(contents, ranges)
+
+
+def test_merge_rejects_segment_count_mismatch():
+    contents = [_page({0}), _page({1}, [2, 2, 3]), _page({2})]
+
+    with pytest.raises(ValueError, match="セグメント数"):
+        merge_chapter_ranges(contents, RANGES)
+
+
+def test_split_chapter_ranges_is_contiguous_and_balanced():
+    chapters = [(f"chapter{i}", i * 100) for i in range(8)]
+
+    ranges = split_chapter_ranges(chapters, 800, 4)
+
+    assert ranges == [
+        ["chapter0", "chapter1"],
+        ["chapter2", "chapter3"],
+        ["chapter4", "chapter5"],
+        ["chapter6", "chapter7"],
+    ]
+
+
+def test_split_chapter_ranges_drops_empty_ranges():
+    chapters = [("chapter0", 0), ("chapter1", 10), ("chapter2", 900)]
+
+    ranges = split_chapter_ranges(chapters, 1000, 4)
+
+    assert ranges == [["chapter0", "chapter1"], ["chapter2"]]
+    assert sum(ranges, []) == [chapter_id for chapter_id, _ in chapters]
+
+
+def test_split_chapter_ranges_single_tab():
+    chapters = [("chapter0", 0), ("chapter1", 10)]
+
+    assert split_chapter_ranges(chapters, 100, 1) == [["chapter0", "chapter1"]]
+    assert split_chapter_ranges([], 100, 4) == [[]]
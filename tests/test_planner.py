@@ -0,0 +1,124 @@
+import pytest
+from src.app.planner import plan_episode
+from src.audio.latency_model import LatencyModel, _usl
+from src.data_models.transcript_models import Chapter, Role, Segment, Transcript
+
+
+def _transcript(segment_count, chars=200, chapter_count=1):
+    """各チャプターに segment_count 件のセグメントを持つ Transcript"""
+    chapters = [
+        Chapter(
+            no=str(no),
+            title="title",
+            segments=[
+                Segment("speaker", "あ" * chars, Role.GUEST)
+                for _ in range(segment_count)
+            ],
+        )
+        for no in range(chapter_count)
+    ]
+    return Transcript(chapters=chapters, episode_name="episode_preprocessed")
+
+
+def _model(tmp_path, latency_by_concurrency, chars=(100, 200, 400)):
+    """並列数ごとに 基準遅延 (1.0秒 + 0.002秒/文字) * 倍率 のサンプルを持つモデル"""
+    model = LatencyModel(str(tmp_path / "latency.json"))
+    for concurrency, ratio in latency_by_concurrency.items():
+        for length in chars:
+            model.record("google", length, (1.0 + 0.002 * length) * ratio, 1.0, concurrency)
+    return model
+
+
+@pytest.fixture(autouse=True)
+def _output_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+def test_contention_coefficients_are_recovered(tmp_path):
+    ratios = {level: _usl(level, 0.05, 0.002) for level in (1, 4, 16)}
+    model = _model(tmp_path, ratios)
+
+    for level in (2, 8, 32):
+        expected = (1.0 + 0.002 * 200) * _usl(level, 0.05, 0.002)
+        assert model.predict_seconds("google", 200, level) == pytest.approx(expected)
+
+
+def test_samples_without_concurrency_count_as_serial(tmp_path):
+    model = LatencyModel(str(tmp_path / "latency.json"))
+    model.samples = {"google": [[100, 1.2, 1.0], [300, 1.6, 3.0]]}
+
+    assert model.observed_concurrency("google") == [1]
+    assert model.predict_seconds("google", 200) == pytest.approx(1.4)
+
+
+@pytest.mark.parametrize("segment_count", [20, 300, 2000])
+def test_default_model_does_not_pick_largest_concurrency(tmp_path, segment_count):
+    plan = plan_episode(
+        _transcript(segment_count), "episode", LatencyModel(str(tmp_path / "none.json"))
+    )
+
+    assert plan.get_engine("google").recommended_concurrency < 32
+
+
+def test_saturating_throughput_picks_knee(tmp_path):
+    # スループット (並列数 / 遅延): 1 -> 1.0, 4 -> 3.3, 16 -> 4.0
+    model = _model(tmp_path, {1: 1.0, 4: 1.2, 16: 4.0})
+
+    plan = plan_episode(_transcript(300), "episode", model)
+    google = plan.get_engine("google")
+
+    assert google.observed_concurrency == [1, 4, 16]
+    assert google.recommended_concurrency in (4, 8)
+    assert google.wall_time_by_concurrency[32] > google.wall_time_by_concurrency[8]
+
+
+def test_linear_scaling_is_bounded_by_quota(tmp_path):
+    model = _model(tmp_path, {1: 1.0, 8: 1.0, 32: 1.0})
+
+    plan = plan_episode(_transcript(2000), "episode", model)
+    google = plan.get_engine("google")
+
+    # 2000リクエスト / 1000回/分 = 120秒より速くはならない
+    assert min(google.wall_time_by_concurrency.values()) == pytest.approx(120)
+    assert google.wall_time_by_concurrency[16] > 120
+    assert google.recommended_concurrency == 32
+
+
+def test_cached_segments_are_not_planned(tmp_path):
+    transcript = _transcript(4)
+    segment_dir = tmp_path / "output" / "audio" / "episode" / "chapter-0"
+    segment_dir.mkdir(parents=True)
+    (segment_dir / "episode_0_0.wav").write_bytes(b"")
+
+    plan = plan_episode(transcript, "episode", LatencyModel(str(tmp_path / "none.json")))
+
+    assert plan.cached_segments == 1
+    assert plan.get_engine("google").new_requests == 3
+    assert plan.get_engine("voicevox").new_requests == 6
+
+
+def test_many_small_chapters_plan_like_one_large_chapter(tmp_path):
+    # 合成は全チャプターを1つのスレッドプールで処理するため、チャプター数によらず並列数いっぱいまで使える
+    model = _model(tmp_path, {1: 1.0, 4: 1.2, 16: 4.0})
+
+    chapters = plan_episode(_transcript(10, chapter_count=40), "episode", model)
+    single = plan_episode(_transcript(400), "episode", model)
+
+    assert chapters.total_segments == 400
+    assert chapters.get_engine("google").wall_time_by_concurrency == pytest.approx(
+        single.get_engine("google").wall_time_by_concurrency
+    )
+    assert chapters.get_engine("google").recommended_concurrency == (
+        single.get_engine("google").recommended_concurrency
+    )
+
+
+def test_concurrency_beyond_chapter_size_is_used(tmp_path):
+    # 並列化で遅延が増えない場合、1チャプターのセグメント数 (10) を超える並列数でも速くなる
+    model = _model(tmp_path, {1: 1.0, 16: 1.0})
+
+    plan = plan_episode(_transcript(10, chapter_count=40), "episode", model)
+    wall_time = plan.get_engine("google").wall_time_by_concurrency
+
+    assert wall_time[16] < wall_time[8]
+    assert plan.get_engine("google").recommended_concurrency >= 16
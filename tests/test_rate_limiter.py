@@ -0,0 +1,15 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.audio.rate_limiter import RateLimiter
+
+
+def test_requests_are_spaced_across_threads():
+    # 6000回/分 = 10ms間隔
+    limiter = RateLimiter(6000)
+    started_at = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(11)))
+
+    # 1回目は即時、残り10回は10msずつ間隔が空く
+    assert time.monotonic() - started_at >= 0.1
@@ -0,0 +1,106 @@
+import pytest
+from src.app.server import (
+    JobCancelledError,
+    JobQueue,
+    JobStatus,
+    parse_job_request,
+)
+
+
+@pytest.fixture
+def state_file(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path / "jobs.json")
+
+
+def test_higher_priority_first_then_fifo(state_file):
+    queue = JobQueue(state_file)
+    first = queue.submit("https://example.com/a", priority=0)
+    second = queue.submit("https://example.com/b", priority=0)
+    urgent = queue.submit("https://example.com/c", priority=5)
+
+    assert [queue.next_job().id for _ in range(3)] == [urgent.id, first.id, second.id]
+
+
+def test_running_job_is_requeued_on_reload(state_file):
+    queue = JobQueue(state_file)
+    job = queue.submit("https://example.com/a")
+    queue.next_job()
+    queue.update_progress(job.id, "synthesize", 20, 40)
+
+    reloaded = JobQueue(state_file)
+    restored = reloaded.get(job.id)
+
+    assert restored.status == JobStatus.QUEUED
+    assert (restored.stage, restored.done, restored.total) == ("", 0, 0)
+    assert reloaded.next_job().id == job.id
+
+
+def test_cancel_queued_job_is_immediate(state_file):
+    queue = JobQueue(state_file)
+    cancelled = queue.submit("https://example.com/a", priority=5)
+    other = queue.submit("https://example.com/b")
+
+    assert queue.cancel(cancelled.id).status == JobStatus.CANCELLED
+    assert queue.next_job().id == other.id
+
+
+def test_cancel_running_job_raises_on_next_progress(state_file):
+    queue = JobQueue(state_file)
+    job = queue.submit("https://example.com/a")
+    queue.next_job()
+    queue.update_progress(job.id, "synthesize", 1, 10)
+
+    assert queue.cancel(job.id).status == JobStatus.RUNNING
+    with pytest.raises(JobCancelledError):
+        queue.update_progress(job.id, "synthesize", 2, 10)
+
+
+def test_cancelled_running_job_is_not_rerun_after_restart(state_file):
+    queue = JobQueue(state_file)
+    job = queue.submit("https://example.com/a")
+    queue.next_job()
+    queue.cancel(job.id)
+
+    reloaded = JobQueue(state_file)
+
+    assert reloaded.get(job.id).status == JobStatus.CANCELLED
+    assert not any(j.status == JobStatus.QUEUED for j in reloaded.list())
+
+
+def test_unknown_job_cannot_be_cancelled(state_file):
+    assert JobQueue(state_file).cancel("missing") is None
+
+
+def test_parse_job_request_defaults():
+    assert parse_job_request({"url": "https://example.com/a"}) == {
+        "url": "https://example.com/a",
+        "priority": 0,
+        "html": None,
+        "tabs": 1,
+        "translator": None,
+        "workers": 1,
+    }
+
+
+def test_parse_job_request_auto_workers():
+    request = parse_job_request({"url": "https://example.com/a", "workers": "auto"})
+
+    assert request["workers"] is None
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        {},
+        {"url": 1},
+        {"url": "https://example.com/a", "html": 1},
+        {"url": "https://example.com/a", "translator": ["google"]},
+        {"url": "https://example.com/a", "tabs": 0},
+        {"url": "https://example.com/a", "workers": 0},
+        {"url": "https://example.com/a", "priority": "high"},
+    ],
+)
+def test_parse_job_request_rejects_invalid_fields(body):
+    with pytest.raises((ValueError, KeyError, TypeError)):
+        parse_job_request(body)
@@ -0,0 +1,113 @@
+import json
+import pytest
+from src.translation.memory import TranslationMemory
+from src.translation.translator import (
+    FileTranslator,
+    Translator,
+    _split_batches,
+    translate_transcript_data,
+)
+
+
+class RecordingTranslator(FileTranslator):
+    """受け取ったバッチを記録する FileTranslator"""
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.batches = []
+
+    def translate_batch(self, texts):
+        self.batches.append(list(texts))
+        return super().translate_batch(texts)
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    path = tmp_path / "table.json"
+    path.write_text(
+        json.dumps({"Intro": "導入", "Guest": "ゲスト", "Hi": "やあ", "Yo": "よ"}),
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+TRANSCRIPT = [
+    {
+        "no": 0,
+        "title": "Intro",
+        "segments": [
+            {"speaker": "Lex Fridman", "text": "Hi", "timestamp": "1"},
+            {"speaker": "Guest", "text": "Yo", "timestamp": "2"},
+            {"speaker": "", "text": "Hi", "timestamp": "3"},
+        ],
+    }
+]
+
+
+def test_host_names_are_mapped_without_translation(table_path, tmp_path):
+    translator = RecordingTranslator(table_path)
+    memory = TranslationMemory(translator.memory_key, str(tmp_path / "memory.json"))
+
+    result = translate_transcript_data(TRANSCRIPT, translator, memory)
+
+    assert result[0]["title"] == "導入"
+    assert [s["speaker"] for s in result[0]["segments"]] == [
+        "レックス・フリードマン",
+        "ゲスト",
+        "",
+    ]
+    assert [s["text"] for s in result[0]["segments"]] == ["やあ", "よ", "やあ"]
+    sent = [text for batch in translator.batches for text in batch]
+    assert "Lex Fridman" not in sent
+    assert sorted(sent) == ["Guest", "Hi", "Intro", "Yo"]
+
+
+def test_memory_hits_are_not_translated_again(table_path, tmp_path):
+    memory_path = str(tmp_path / "memory.json")
+    translator = RecordingTranslator(table_path)
+    translate_transcript_data(
+        TRANSCRIPT, translator, TranslationMemory(translator.memory_key, memory_path)
+    )
+
+    translator = RecordingTranslator(table_path)
+    translate_transcript_data(
+        TRANSCRIPT, translator, TranslationMemory(translator.memory_key, memory_path)
+    )
+
+    assert translator.batches == []
+
+
+def test_memory_of_another_backend_is_rejected(table_path, tmp_path):
+    translator = FileTranslator(table_path)
+    memory = TranslationMemory("google-ja", str(tmp_path / "memory.json"))
+
+    with pytest.raises(ValueError):
+        translate_transcript_data(TRANSCRIPT, translator, memory)
+
+
+def test_split_batches_caps_count_and_chars():
+    texts = ["a" * 400, "b" * 400, "c" * 300, "d" * 900, "e", "f", "g"]
+
+    batches = _split_batches(texts, batch_size=2, max_batch_chars=1000)
+
+    assert batches == [
+        ["a" * 400, "b" * 400],
+        ["c" * 300],
+        ["d" * 900, "e"],
+        ["f", "g"],
+    ]
+
+
+def test_split_batches_keeps_oversized_text_alone():
+    batches = _split_batches(["x" * 50, "y" * 2000, "z"], batch_size=10, max_batch_chars=100)
+
+    assert batches == [["x" * 50], ["y" * 2000], ["z"]]
+
+
+def test_incomplete_translator_fails_on_creation():
+    class Incomplete(Translator):
+        def translate_batch(self, texts):
+            return texts
+
+    with pytest.raises(TypeError):
+        Incomplete()